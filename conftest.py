@@ -0,0 +1,10 @@
+import pytest
+
+from test_mouth import get_mouth
+
+@pytest.fixture(scope="session")
+def mouth():
+    """One Mouth for the whole pytest run, closed once every test is done"""
+    tts = get_mouth()
+    yield tts
+    tts.close()
@@ -1,49 +1,605 @@
 import os
-import sounddevice as sd
-import numpy as np
+import json
+import contextlib
+import hashlib
+import logging
+import math
+import mmap
+import platform
+import threading
+import queue
+import re
+import tempfile
+import time
+from collections import OrderedDict
 import gc
-from piper.voice import PiperVoice
+
+class _NoPortAudioError(Exception):
+    # Never raised; stands in for sounddevice.PortAudioError in except clauses when
+    # sounddevice couldn't be imported
+    pass
+
+# Imported by the first Mouth() (see _setup_pi_audio), so importing mouth stays
+# cheap and a machine without PortAudio can still synthesize
+sd = None
+_PortAudioError = _NoPortAudioError
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_VOICE = "en_US-hfc_female-medium.onnx"
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/piper-tts-string")
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+RECENT_ENTRIES = 32
+RECENT_MAX_BYTES = 4 * 1024 * 1024
+OUTPUT_RATES = (16000, 22050, 44100, 48000)
+GPU_PROVIDERS = ("CUDAExecutionProvider", "CoreMLExecutionProvider")
+
+# Loaded voices shared by every Mouth in the process, keyed by (model, config, mtime)
+_VOICE_CACHE = {}
+_VOICE_CACHE_LOCK = threading.Lock()
+# (onnx, json) pair resolved per voice directory, so later Mouths skip the scan
+_MODEL_FILES = {}
 
 class Mouth:
-    def __init__(self, chunk_size=1024):
+    def __init__(self, chunk_size=1024, warmup=True, quantize=None, cache_dir=DEFAULT_CACHE_DIR,
+                 cache_max_bytes=CACHE_MAX_BYTES, recent_entries=RECENT_ENTRIES,
+                 recent_max_bytes=RECENT_MAX_BYTES):
         self.chunk_size = chunk_size
-        self.voicedir = "./"
-        self.model = self.voicedir + "en_US-hfc_female-medium.onnx"
-        self.voice = PiperVoice.load(self.model)
-        self.sample_rate = self.voice.config.sample_rate
+        # Set before the voice loads: a read-only voice directory keeps its
+        # optimized graph here too
+        self.cache_dir = cache_dir
+        self._init_voice(quantize)
+        # The last few utterances stay in memory ahead of the disk cache, keyed by
+        # normalized text; it is the only cache when cache_dir is None
+        self.recent_entries = recent_entries
+        self.recent_max_bytes = recent_max_bytes
+        self._recent = OrderedDict()
+        self._recent_bytes = 0
+        self._recent_lock = threading.Lock()
+        self._speak_lock = threading.Lock()
+        self.cache_max_bytes = cache_max_bytes
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError as e:
+                # A read-only home shouldn't stop speech, only the replay cache
+                _LOGGER.warning("Audio cache disabled, cannot create %s: %s", self.cache_dir, e)
+                self.cache_dir = None
+        if self.cache_dir:
+            # Salting with the model's size/mtime retires entries when the voice is replaced
+            with open(self.json_file, "rb") as config_file:
+                self._cache_salt = hashlib.sha256(
+                    (self.model + self._fingerprint(self.model)).encode() + config_file.read()).digest()
         self._setup_pi_audio()
+        if warmup:
+            self._warmup()
+
+    @classmethod
+    def preload(cls, quantize=None):
+        # Pay the multi-second model load (and first-inference warm-up) at app
+        # startup so the first Mouth() later on is instant
+        mouth = cls.__new__(cls)
+        mouth.stream = None
+        mouth.cache_dir = DEFAULT_CACHE_DIR
+        mouth._init_voice(quantize)
+        mouth._warmup()
+
+    def _init_voice(self, quantize):
+        self.voicedir = os.environ.get("PIPER_MODEL_DIR", "./")
+        self.model, self.json_file = self._detect_model_files()
+        # quantize=None uses an INT8 model built earlier, True builds one, False forces FP32
+        quantized_model = self.model.removesuffix(".onnx") + ".int8.onnx"
+        if quantize:
+            self.model = self._quantized_model(quantized_model)
+        elif quantize is None and self._is_fresh(quantized_model, self.model):
+            self.model = quantized_model
+        self._synthesis_cores, self._playback_core = self._split_cores()
+        # Load once; every speak() reuses the same in-process ONNX session
+        self.voice = self._load_voice()
+        self.sample_rate = self.voice.config.sample_rate
+
+    def _split_cores(self):
+        # Off Linux, or with too few CPUs to spare one, leave placement to the scheduler
+        try:
+            cores = sorted(os.sched_getaffinity(0))
+        except AttributeError:
+            return None, None
+        if len(cores) < 3:
+            return None, None
+        # Synthesis keeps all but the last CPU; the stream writer gets that one to itself
+        return cores[:-1], cores[-1]
+
+    def _detect_model_files(self):
+        model_files = _MODEL_FILES.get(self.voicedir)
+        if model_files and all(os.path.exists(path) for path in model_files):
+            return model_files
+        # Single directory pass; each .onnx is paired with its .onnx.json by set lookup
+        onnx_files, json_files = [], set()
+        with os.scandir(self.voicedir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".onnx"):
+                    onnx_files.append(entry.name)
+                elif entry.name.endswith(".json"):
+                    json_files.add(entry.name)
+        for name in sorted(onnx_files, key=lambda n: (n != DEFAULT_VOICE, n)):
+            if f"{name}.json" in json_files:
+                model_files = os.path.join(self.voicedir, name), os.path.join(self.voicedir, f"{name}.json")
+                _MODEL_FILES[self.voicedir] = model_files
+                return model_files
+        raise FileNotFoundError(f"No Piper voice (.onnx with matching .onnx.json) in {self.voicedir}")
+
+    def _load_config(self):
+        from piper.config import PiperConfig
+        with open(self.json_file, "r", encoding="utf-8") as config_file:
+            return PiperConfig.from_dict(json.load(config_file))
+
+    def _load_voice(self):
+        from piper.voice import PiperVoice
+        # mtime in the key makes a replaced model load fresh instead of reusing the old session
+        key = (os.path.realpath(self.model), os.path.realpath(self.json_file), os.path.getmtime(self.model))
+        with _VOICE_CACHE_LOCK:
+            if key not in _VOICE_CACHE:
+                # A replaced model supersedes its old session; don't keep that alive
+                # for the rest of the process (Mouths still using it hold their own reference)
+                for stale in [cached for cached in _VOICE_CACHE if cached[:2] == key[:2]]:
+                    del _VOICE_CACHE[stale]
+                _VOICE_CACHE[key] = PiperVoice(config=self._load_config(), session=self._create_session())
+            return _VOICE_CACHE[key]
+
+    def _quantized_model(self, quantized_model):
+        # INT8 weights halve memory traffic; quantize once and reuse the file
+        if self._is_fresh(quantized_model, self.model):
+            return quantized_model
+        # A failed drift check is remembered for this exact source model, so it
+        # isn't re-measured on every start
+        rejected = quantized_model + ".rejected"
+        try:
+            with open(rejected) as sentinel:
+                if sentinel.read() == self._fingerprint(self.model):
+                    return self.model
+        except OSError:
+            pass
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        import numpy as np
+        quantize_dynamic(self.model, quantized_model, weight_type=QuantType.QInt8)
+        config = self._load_config()
+        drift = np.abs(self._band_energies(self.model, config) - self._band_energies(quantized_model, config))
+        if drift.mean() > 3.0:
+            _LOGGER.warning("Quantized model drifts %.1f dB from the original, keeping FP32", drift.mean())
+            os.remove(quantized_model)
+            with contextlib.suppress(OSError), open(rejected, "w") as sentinel:
+                sentinel.write(self._fingerprint(self.model))
+            return self.model
+        self._mark_fresh(quantized_model, self.model)
+        return quantized_model
+
+    def _band_energies(self, model_path, config):
+        import numpy as np
+        import onnxruntime
+        from piper.voice import PiperVoice
+        session = onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        audio_bytes = b"".join(PiperVoice(config=config, session=session).synthesize_stream_raw(
+            "The quick brown fox jumps over the lazy dog."))
+        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
+        frames = audio[:len(audio) // 1024 * 1024].reshape(-1, 1024)
+        spectrum = (np.abs(np.fft.rfft(frames, axis=1)) ** 2).mean(axis=0)
+        return 10 * np.log10(np.add.reduceat(spectrum, np.arange(0, spectrum.size, 16)) + 1e-9)
+
+    def _create_session(self):
+        import onnxruntime
+        import psutil
+        sess_options = onnxruntime.SessionOptions()
+        sess_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # The vocoder convolutions parallelize within each op, not across the graph.
+        # One thread per physical core; SMT siblings only thrash each other's caches
+        sess_options.intra_op_num_threads = psutil.cpu_count(logical=False) or os.cpu_count() or 4
+        if self._synthesis_cores:
+            # Pin the pool so sentence after sentence runs on cache-warm cores. Thread 0
+            # is the caller (the producer pins itself); ORT numbers processors from 1
+            sess_options.intra_op_num_threads = min(sess_options.intra_op_num_threads, len(self._synthesis_cores))
+            pool_cores = self._synthesis_cores[1:sess_options.intra_op_num_threads]
+            if pool_cores:
+                sess_options.add_session_config_entry("session.intra_op_thread_affinities",
+                                                      ";".join(str(core + 1) for core in pool_cores))
+        sess_options.inter_op_num_threads = 1
+        sess_options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        sess_options.enable_cpu_mem_arena = True
+        # Idle worker threads would otherwise spin between sentences and steal
+        # CPU from playback and the rest of the system
+        sess_options.add_session_config_entry("session.intra_op.allow_spinning", "0")
+        # Piper always runs one utterance at a time; pinning the batch axis lets
+        # ORT plan memory statically instead of re-inferring shapes per run
+        sess_options.add_free_dimension_override_by_name("batch_size", 1)
+        sess_options.enable_mem_pattern = True
+        # Use a GPU when ORT has one, keeping CPU as the fallback for unsupported ops
+        available = onnxruntime.get_available_providers()
+        providers = [provider for provider in GPU_PROVIDERS if provider in available] + ["CPUExecutionProvider"]
+        if len(providers) > 1:
+            return onnxruntime.InferenceSession(self.model, sess_options=sess_options, providers=providers)
+        # Graph optimization dominates session creation, so keep the optimized
+        # graph and load it directly on later runs. Only done on CPU, since an
+        # optimized graph is tied to the providers it was built for
+        optimized_model = self._optimized_model_path(onnxruntime.__version__)
+        if optimized_model and self._is_fresh(optimized_model, self.model):
+            self._prefetch(optimized_model)
+            try:
+                return onnxruntime.InferenceSession(optimized_model, sess_options=sess_options, providers=providers)
+            except Exception as e:
+                _LOGGER.warning("Ignoring unreadable optimized model %s: %s", optimized_model, e)
+                with contextlib.suppress(OSError):
+                    os.remove(optimized_model)
+        self._prefetch(self.model)
+        if optimized_model:
+            sess_options.optimized_model_filepath = optimized_model
+            try:
+                session = onnxruntime.InferenceSession(self.model, sess_options=sess_options, providers=providers)
+            except Exception as e:
+                # ORT reports a failed save as a generic Fail; build without saving
+                _LOGGER.warning("Could not save optimized model %s: %s", optimized_model, e)
+                sess_options.optimized_model_filepath = ""
+            else:
+                with contextlib.suppress(OSError):
+                    self._mark_fresh(optimized_model, self.model)
+                return session
+        return onnxruntime.InferenceSession(self.model, sess_options=sess_options, providers=providers)
+
+    def _optimized_model_path(self, ort_version):
+        # ENABLE_ALL layouts (NCHWc) are specific to the CPU they were built on,
+        # so the architecture is part of the name along with the ORT version
+        name = f"{os.path.basename(self.model)}.{platform.machine()}.{ort_version}.ort"
+        # Beside the model when that directory is writable, else under this
+        # Mouth's cache_dir; with neither, the graph is simply rebuilt each start
+        directories = [os.path.dirname(self.model) or "."]
+        if self.cache_dir:
+            directories.append(os.path.join(self.cache_dir, "models"))
+        for directory in directories:
+            with contextlib.suppress(OSError):
+                os.makedirs(directory, exist_ok=True)
+            if os.access(directory, os.W_OK):
+                return os.path.join(directory, name)
+        return None
+
+    def _is_fresh(self, artifact, source):
+        # Derived files record which source they were built from, so a replaced
+        # model invalidates them without re-hashing its weights on every start
+        try:
+            with open(artifact + ".src") as sentinel:
+                return os.path.exists(artifact) and sentinel.read() == self._fingerprint(source)
+        except OSError:
+            return False
+
+    def _mark_fresh(self, artifact, source):
+        with open(artifact + ".src", "w") as sentinel:
+            sentinel.write(self._fingerprint(source))
+
+    def _fingerprint(self, path):
+        st = os.stat(path)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    def _prefetch(self, path):
+        # ORT reads the whole file and keeps its own copy of the weights, so there
+        # is nothing worth mapping or pinning; just start the kernel's readahead
+        # (slow on an SD card) before ORT gets to it
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except (AttributeError, OSError):
+            pass
+        finally:
+            os.close(fd)
 
     def _setup_pi_audio(self):
+        global sd, _PortAudioError
         if 'ALSA_CARDNO' not in os.environ:
             os.environ['ALSA_CARDNO'] = '0'
         if 'PULSE_RUNTIME_PATH' in os.environ:
             del os.environ['PULSE_RUNTIME_PATH']
+        self.stream = None
+        if sd is None:
+            try:
+                import sounddevice
+            except OSError as e:
+                # No PortAudio library at all (headless CI, containers): synthesize
+                # without playback; the next Mouth tries the import again
+                _LOGGER.warning("Audio output unavailable: %s", e)
+                self.output_rate = self.sample_rate
+                return
+            sd, _PortAudioError = sounddevice, sounddevice.PortAudioError
+        self.output_rate = self._pick_output_rate()
+        ratio_gcd = math.gcd(self.output_rate, self.sample_rate)
+        self._resample_up = self.output_rate // ratio_gcd
+        self._resample_down = self.sample_rate // ratio_gcd
+        # One stream for the life of the object; reopening it per utterance costs
+        # a device reconfiguration and an audible pop
+        try:
+            self.stream = sd.RawOutputStream(samplerate=self.output_rate, channels=1, dtype='int16',
+                                             blocksize=self.chunk_size, latency='low')
+            self.stream.start()
+        except _PortAudioError as e:
+            _LOGGER.warning("Could not open audio output: %s", e)
+            self.stream = None
+
+    def _pick_output_rate(self):
+        # Let PortAudio/ALSA take Piper's native rate when they can; otherwise
+        # settle on the closest rate at or above it, probed once here so speak()
+        # never has to retry
+        if self._rate_supported(self.sample_rate):
+            return self.sample_rate
+        supported = [rate for rate in OUTPUT_RATES if self._rate_supported(rate)]
+        higher = [rate for rate in supported if rate > self.sample_rate]
+        if higher:
+            return min(higher)
+        if supported:
+            return max(supported)
+        try:
+            return int(sd.query_devices(kind='output')['default_samplerate'])
+        except (_PortAudioError, ValueError):
+            return self.sample_rate
+
+    def _rate_supported(self, rate):
+        try:
+            sd.check_output_settings(samplerate=rate, channels=1, dtype='int16')
+            return True
+        except _PortAudioError:
+            return False
+
+    def _warmup(self):
+        # First inference pays ORT's lazy memory planning and kernel selection
+        try:
+            for _ in self.voice.synthesize_stream_raw("a"):
+                pass
+        except Exception as e:
+            _LOGGER.warning("Warm-up synthesis failed: %s", e)
+        # Likewise the first write negotiates buffers with the device; do it
+        # with a block of silence rather than the first real sentence
+        if self.stream is not None:
+            try:
+                self.stream.write(bytes(2 * self.chunk_size))
+            except _PortAudioError as e:
+                _LOGGER.warning("Audio warm-up failed: %s", e)
 
     def speak(self, text):
         if not text.strip():
             return
         
-        audio_chunks = []
-        for audio_bytes in self.voice.synthesize_stream_raw(text):
-            int_data = np.frombuffer(audio_bytes, dtype=np.int16)
-            audio_chunks.append(int_data)
-        if not audio_chunks:
-            return
-        audio = np.concatenate(audio_chunks)
-        # Normalize to float32 in [-1, 1]
-        audio = audio.astype(np.float32) / 32768.0
-        # Ensure mono
-        if len(audio.shape) > 1 and audio.shape[1] == 2:
-            audio = audio.mean(axis=1)
-        self._play_audio(audio, self.sample_rate)
+        # One stream per Mouth: concurrent speak()/speak_async() calls take turns
+        # rather than interleaving their sentences on the device
+        with self._speak_lock:
+            key = self._cache_text(text)
+            with self._recent_lock:
+                recent = self._recent.get(key)
+                if recent is not None:
+                    self._recent.move_to_end(key)
+            cache_path = self._cache_path(text)
+            cached = self._open_cached(cache_path) if recent is None and cache_path else None
+            try:
+                if recent is not None:
+                    with self._realtime_priority(), self._pinned(self._playback_core):
+                        self._write(recent)
+                elif cached is not None:
+                    _LOGGER.debug("Playing cached audio %s", cache_path)
+                    with cached, self._realtime_priority(), self._pinned(self._playback_core):
+                        self._write(cached)
+                    # Refresh atime explicitly; relatime mounts won't do it for us
+                    with contextlib.suppress(OSError):
+                        os.utime(cache_path)
+                else:
+                    # Piper yields mono int16 bytes per sentence; play each one as it
+                    # arrives instead of waiting for the whole utterance. The producer
+                    # starts before the priority boost so it doesn't inherit it
+                    chunks = self._synthesize_ahead(text)
+                    # Only collect the utterance while some cache can still keep it, so
+                    # uncached long text stays bounded to a sentence or two in memory
+                    keep_recent = self.recent_entries > 0 and self.recent_max_bytes > 0
+                    pcm = bytearray() if cache_path or keep_recent else None
+                    with self._realtime_priority(), self._pinned(self._playback_core):
+                        for audio_bytes in chunks:
+                            self._write(audio_bytes)
+                            if pcm is not None:
+                                pcm.extend(audio_bytes)
+                                if not cache_path and len(pcm) > self.recent_max_bytes:
+                                    pcm = None
+                    if pcm:
+                        self._remember(key, pcm)
+                    if cache_path and pcm:
+                        self._store_cached(cache_path, pcm)
+            except _PortAudioError as e:
+                _LOGGER.warning("Audio playback failed: %s", e)
         gc.collect()
 
-    def _play_audio(self, audio, sample_rate):
+    def speak_to_bytes(self, text):
+        # Raw mono int16 PCM at sample_rate, without playing or caching it
+        if not text.strip():
+            return b""
+        return b"".join(self.voice.synthesize_stream_raw(text))
+
+    def _synthesize_ahead(self, text):
+        # Synthesize on a worker thread so the next sentence is computed while the
+        # current one plays; the bounded queue keeps at most two sentences buffered
+        chunks = queue.Queue(maxsize=2)
+        stop = threading.Event()
+
+        def produce():
+            if self._synthesis_cores:
+                os.sched_setaffinity(0, self._synthesis_cores[:1])
+            try:
+                for audio_bytes in self.voice.synthesize_stream_raw(text):
+                    chunks.put(audio_bytes)
+                    if stop.is_set():
+                        return
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(None)
+
+        def consume():
+            try:
+                while (item := chunks.get()) is not None:
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                # Unblock the producer if playback stopped early
+                stop.set()
+                while worker.is_alive():
+                    try:
+                        chunks.get(timeout=0.05)
+                    except queue.Empty:
+                        pass
+
+        worker = threading.Thread(target=produce, daemon=True)
+        worker.start()
+        return consume()
+
+    @contextlib.contextmanager
+    def _realtime_priority(self):
+        # Underruns come from the writing thread being preempted, so give only
+        # that thread SCHED_FIFO and only while it writes; falls back silently
+        # without CAP_SYS_NICE or off Linux
         try:
-            if np.max(np.abs(audio)) > 1.0:
-                audio = audio / np.max(np.abs(audio))
-            audio_int16 = (audio * 32767).astype(np.int16)
-            sd.play(audio_int16, sample_rate, blocksize=self.chunk_size)
-            sd.wait()
-        except Exception as e:
-            print(f"Audio playback failed: {e}")
+            previous = (os.sched_getscheduler(0), os.sched_getparam(0))
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(20))
+        except (AttributeError, OSError):
+            previous = None
+        try:
+            yield
+        finally:
+            if previous is not None:
+                os.sched_setscheduler(0, *previous)
+
+    @contextlib.contextmanager
+    def _pinned(self, core):
+        # Keep the writing thread off the synthesis cores while it plays
+        if core is None:
+            yield
+            return
+        previous = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {core})
+        try:
+            yield
+        finally:
+            os.sched_setaffinity(0, previous)
+
+    def _write(self, audio_bytes):
+        if self.stream is None:
+            return
+        if self.output_rate != self.sample_rate:
+            audio_bytes = self._resample(audio_bytes)
+        self.stream.write(audio_bytes)
+
+    def _cache_text(self, text):
+        # Spacing differences don't change what Piper says, so they share an entry
+        return re.sub(r"[ \t]+", " ", text.strip())
+
+    def _remember(self, key, audio_bytes):
+        # Long utterances are left to the disk cache rather than pinned in RAM
+        if len(audio_bytes) > self.recent_max_bytes:
+            return
+        with self._recent_lock:
+            self._recent_bytes += len(audio_bytes) - len(self._recent.pop(key, b""))
+            self._recent[key] = audio_bytes
+            while len(self._recent) > self.recent_entries or self._recent_bytes > self.recent_max_bytes:
+                _, evicted = self._recent.popitem(last=False)
+                self._recent_bytes -= len(evicted)
+
+    def _cache_path(self, text):
+        if not self.cache_dir:
+            return None
+        key = hashlib.blake2b(self._cache_salt + self._cache_text(text).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, key + ".pcm")
+
+    def _open_cached(self, cache_path):
+        # Map the entry instead of reading it so PortAudio copies straight out of
+        # the page cache. Another process may evict it at any moment; that's a miss
+        try:
+            with open(cache_path, "rb") as cache_file:
+                return mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached(self, cache_path, audio_bytes):
+        # A unique temp file per store, so two writers of the same text can't
+        # interleave into one file; the rename publishes it whole
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with open(fd, "wb") as cache_file:
+                cache_file.write(audio_bytes)
+            os.replace(tmp_path, cache_path)
+            tmp_path = None
+            self._evict_cached()
+        except OSError as e:
+            _LOGGER.warning("Could not cache synthesized audio: %s", e)
+        finally:
+            if tmp_path is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+
+    def _evict_cached(self):
+        # Drop least recently played entries once the cache outgrows its budget,
+        # along with temp files a crashed writer left behind (a live store takes
+        # milliseconds, so an hour-old one is abandoned)
+        cached = []
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                with contextlib.suppress(OSError):
+                    if entry.name.endswith(".pcm"):
+                        cached.append((entry.stat(), entry.path))
+                    elif entry.name.endswith(".tmp") and time.time() - entry.stat().st_mtime > 3600:
+                        os.remove(entry.path)
+        total = sum(st.st_size for st, _ in cached)
+        for st, path in sorted(cached, key=lambda item: item[0].st_atime):
+            if total <= self.cache_max_bytes:
+                break
+            # Another process may have evicted it already
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total -= st.st_size
+
+    def _resample(self, audio_bytes):
+        import numpy as np
+        audio = np.frombuffer(audio_bytes, dtype=np.int16)
+        try:
+            import soxr
+        except ImportError:
+            pass
+        else:
+            # soxr's SIMD resampler works on int16 directly, no float round trip
+            return soxr.resample(audio, self.sample_rate, self.output_rate, quality='HQ')
+        # Polyphase FIR is far cheaper than FFT resampling for ratios like 160/147
+        from scipy.signal import resample_poly
+        audio = audio.astype(np.float32)
+        audio = resample_poly(audio, self._resample_up, self._resample_down)
+        # Clip and narrow to int16 in one pass; RawOutputStream takes the array's
+        # buffer directly, so no tobytes() copy either
+        return np.clip(audio, -32768, 32767, out=np.empty(audio.shape, dtype=np.int16), casting='unsafe')
+
+    async def speak_async(self, text):
+        import asyncio
+        # Synthesis and playback block, so keep them off the event loop
+        await asyncio.to_thread(self.speak, text)
+
+    def close(self):
+        stream, self.stream = self.stream, None
+        if stream is not None:
+            try:
+                stream.stop()
+            finally:
+                stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Replay cache and output rate tests for Mouth - run headless under pytest
+"""
+
+import os
+import types
+
+import pytest
+
+import mouth
+from mouth import Mouth
+
+def no_synthesis(text):
+    raise AssertionError(f"should have replayed {text!r} from the cache")
+
+def cached_files(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith(".pcm"))
+
+def test_disk_cache_miss_then_hit(tmp_path):
+    """Speaking the same text twice synthesizes once and stores one entry"""
+    tts = Mouth(warmup=False, cache_dir=str(tmp_path), recent_entries=0)
+    tts.speak("Cache this sentence.")
+    assert len(cached_files(tmp_path)) == 1
+
+    tts._synthesize_ahead = no_synthesis
+    tts.speak("Cache this sentence.")
+    assert len(cached_files(tmp_path)) == 1
+
+def test_spacing_shares_cache_entry(tmp_path):
+    """Runs of spaces and surrounding whitespace don't create new entries"""
+    tts = Mouth(warmup=False, cache_dir=str(tmp_path), recent_entries=0)
+    tts.speak("a  b")
+    tts._synthesize_ahead = no_synthesis
+    tts.speak(" a b ")
+    assert len(cached_files(tmp_path)) == 1
+    assert tts._cache_text("a  b") == tts._cache_text("a b")
+
+def test_disk_cache_evicts_least_recently_played(tmp_path):
+    """Eviction drops the oldest entries until the cache fits its budget"""
+    tts = Mouth(warmup=False, cache_dir=str(tmp_path), cache_max_bytes=250, recent_entries=0)
+    old, recent, newest = (tts._cache_path(text) for text in ("old", "recent", "newest"))
+    tts._store_cached(old, b"x" * 100)
+    tts._store_cached(recent, b"x" * 100)
+    os.utime(old, (1, 1))
+    os.utime(recent, (2, 2))
+    tts._store_cached(newest, b"x" * 100)
+    assert cached_files(tmp_path) == sorted(os.path.basename(path) for path in (recent, newest))
+
+def test_recent_cache_byte_accounting():
+    """The in-memory cache's byte total matches what it holds after evictions"""
+    tts = Mouth(warmup=False, cache_dir=None, recent_entries=3, recent_max_bytes=100)
+    for key, size in (("a", 60), ("b", 30), ("c", 50), ("b", 20), ("too big", 101), ("d", 10), ("e", 10)):
+        tts._remember(key, b"x" * size)
+        assert tts._recent_bytes == sum(len(audio) for audio in tts._recent.values())
+        assert tts._recent_bytes <= 100 and len(tts._recent) <= 3
+    assert list(tts._recent) == ["b", "d", "e"]
+
+@pytest.mark.parametrize("supported, expected", [
+    ({22050, 44100}, 22050),  # native rate
+    ({16000, 48000}, 48000),  # nearest rate above native
+    ({16000}, 16000),         # nothing above, best below
+    (set(), 32000),           # nothing in the list, device default
+])
+def test_pick_output_rate(monkeypatch, supported, expected):
+    """Output rate probing prefers native, then higher, then lower rates"""
+    class FakePortAudioError(Exception):
+        pass
+
+    def check_output_settings(samplerate, **kwargs):
+        if samplerate not in supported:
+            raise FakePortAudioError(samplerate)
+
+    fake_sd = types.SimpleNamespace(check_output_settings=check_output_settings,
+                                    query_devices=lambda kind: {"default_samplerate": 32000.0})
+    tts = Mouth(warmup=False, cache_dir=None)
+    monkeypatch.setattr(mouth, "sd", fake_sd)
+    monkeypatch.setattr(mouth, "_PortAudioError", FakePortAudioError)
+    tts.sample_rate = 22050
+    assert tts._pick_output_rate() == expected
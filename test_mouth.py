@@ -3,22 +3,57 @@
 Simple test for Mouth TTS class - convert text to speech
 """
 
+import statistics
+import time
+from functools import lru_cache
+
 from mouth import Mouth
 
-def test_basic_speech():
+@lru_cache(maxsize=1)
+def get_mouth():
+    """One Mouth per process, so each test reuses the loaded voice and its audio stream"""
+    # No disk cache: tests must synthesize every run and not write into ~/.cache
+    return Mouth(cache_dir=None)
+
+def test_basic_speech(mouth):
     """Test basic text-to-speech functionality"""
-    try:
-        # Initialize TTS engine
-        tts = Mouth()
-        
-        # Test with a simple string
-        test_text = "Hello there! This is a test of the text to speech system."
-        tts.speak(test_text)
+    # Test with a simple string
+    test_text = "Hello there! This is a test of the text to speech system."
+    mouth.speak(test_text)
+    if mouth.stream is None:
+        # Headless machine: synthesis still ran, there was just nowhere to play it
+        print('Successful! (no audio output, playback skipped)')
+    else:
         print('Successful!')
-        
-    except Exception as e:
-        print(f" Speech test failed: {e}")
-        return False
+
+def test_real_time_factor(mouth):
+    """Benchmark steady-state synthesis speed as a real-time factor"""
+    benchmark_text = "The quick brown fox jumps over the lazy dog. Pack my box with five dozen liquor jugs."
+
+    # The first run still pays one-off costs, so it is only checked, not timed
+    audio_bytes = mouth.speak_to_bytes(benchmark_text)
+    # Mono int16 PCM: whole samples only
+    assert audio_bytes and len(audio_bytes) % 2 == 0
+
+    # VITS output length varies from run to run, so each run is scored
+    # against the audio it actually produced
+    factors = []
+    for _ in range(5):
+        start = time.perf_counter()
+        audio_bytes = mouth.speak_to_bytes(benchmark_text)
+        elapsed = time.perf_counter() - start
+        audio_seconds = len(audio_bytes) / (2 * mouth.sample_rate)
+        assert audio_seconds > 0
+        factors.append(elapsed / audio_seconds)
+
+    rtf = statistics.median(factors)
+    print(f"Real-time factor: {rtf:.2f} ({'faster' if rtf < 1.0 else 'slower'} than real time)")
+    assert rtf < 1.0
+
+    # Blank text is skipped without synthesis, as it is by speak()
+    assert mouth.speak_to_bytes("  ") == b""
 
 if __name__ == "__main__":
-    test_basic_speech()
\ No newline at end of file
+    # Run directly, the tests share get_mouth() instead of the pytest fixture
+    test_basic_speech(get_mouth())
+    test_real_time_factor(get_mouth())
\ No newline at end of file